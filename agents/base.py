@@ -41,16 +41,17 @@ def load_json_file(path: Path, default: Any = None) -> Any:
 
 def write_json_file(path: Path, data: Any) -> None:
     """写入 JSON 文件"""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 延迟导入，确保 sys.path 已设置
+    from infra.io_utils import write_json
+
+    write_json(path, data, indent=2)
 
 
 def append_event(run_dir: Path, event: dict) -> None:
     """追加事件到 events.jsonl"""
-    events_path = run_dir / "events.jsonl"
-    events_path.parent.mkdir(parents=True, exist_ok=True)
-    with events_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    from infra.io_utils import append_jsonl
+
+    append_jsonl(run_dir / "events.jsonl", event)
 
 
 def resolve_path_under(base: Path, rel_path: str) -> Path | None:
@@ -42,7 +42,7 @@ def _run_failure_report_agent(
     report_dir.mkdir(parents=True, exist_ok=True)
     context_file = report_dir / "failure_context.json"
     
-    write_json(context_file, failure_context)
+    write_json(context_file, failure_context, indent=2)
     
     cmd = [
         "python", str(agent_path),
@@ -16,7 +16,7 @@ def update_plan_status(root: Path, plan_id: str, removed: list[dict]) -> None:
     plan = read_json(plan_path)
     plan["last_cleanup_ts"] = time.time()
     plan["cleanup_snapshot"] = removed
-    write_json(plan_path, plan)
+    write_json(plan_path, plan, indent=2)
 
 
 # 主入口，解析命令行参数，读取文件内容
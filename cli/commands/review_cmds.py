@@ -50,7 +50,7 @@ def cmd_cancel(args, root: Path):
 
     meta["status"] = "canceled"
     meta["canceled_at"] = time.time()
-    write_json(meta_path, meta)
+    write_json(meta_path, meta, indent=2)
 
     append_jsonl(
         run_dir / "events.jsonl",
@@ -88,7 +88,7 @@ def cmd_pause(args, root: Path):
 
     meta["status"] = "paused"
     meta["paused_at"] = time.time()
-    write_json(meta_path, meta)
+    write_json(meta_path, meta, indent=2)
 
     append_jsonl(
         run_dir / "events.jsonl",
@@ -122,7 +122,7 @@ def cmd_resume(args, root: Path):
 
     meta["status"] = "running"
     meta["resumed_at"] = time.time()
-    write_json(meta_path, meta)
+    write_json(meta_path, meta, indent=2)
 
     append_jsonl(
         run_dir / "events.jsonl",
@@ -169,7 +169,7 @@ def cmd_cancel_plan_runs(args, root: Path):
 
             meta["status"] = "canceled"
             meta["canceled_at"] = time.time()
-            write_json(meta_path, meta)
+            write_json(meta_path, meta, indent=2)
 
             append_jsonl(
                 run_dir / "events.jsonl",
@@ -231,7 +231,7 @@ def cmd_rework(args, root: Path):
         "scope": args.scope,
         "ts": time.time(),
     }
-    write_json(round_dir / "rework_request.json", payload)
+    write_json(round_dir / "rework_request.json", payload, indent=2)
     append_jsonl(run_dir / "events.jsonl", {"type": "rework_start", "run_id": meta.get("run_id"), "step": step_id, "round": next_round, "ts": time.time()})
 
     cancel_flag = run_dir / "cancel.flag"
@@ -240,12 +240,12 @@ def cmd_rework(args, root: Path):
 
     # ensure the run transitions to running before the child process starts
     meta.update({"status": "running", "updated_at": time.time()})
-    write_json(run_dir / "meta.json", meta)
+    write_json(run_dir / "meta.json", meta, indent=2)
     update_run_status(root, run_dir.name, "running")
     cmd = ["python", "scripts/subagent_shim.py", "--root", str(root), str(run_dir), task_id, step_id, str(next_round), "good", "--workspace", stage_root, "--workspace-main", main_root]
     subprocess.check_call(cmd, cwd=root)
     passed, reasons = VerifierService(root).verify_task(run_dir, task_id, workspace_path=Path(stage_root))
-    write_json(round_dir / "verification.json", {"passed": passed, "reasons": reasons})
+    write_json(round_dir / "verification.json", {"passed": passed, "reasons": reasons}, indent=2)
     append_jsonl(run_dir / "events.jsonl", {"type": "rework_done", "run_id": meta.get("run_id"), "step": step_id, "round": next_round, "passed": passed, "ts": time.time()})
     append_jsonl(run_dir / "events.jsonl", {"type": "step_round_verified", "run_id": meta.get("run_id"), "step": step_id, "round": next_round, "passed": passed, "ts": time.time()})
     if passed:
@@ -260,13 +260,13 @@ def cmd_rework(args, root: Path):
             "status": "awaiting_review",
             "updated_at": time.time(),
         })
-        write_json(run_dir / "meta.json", meta)
+        write_json(run_dir / "meta.json", meta, indent=2)
         append_jsonl(run_dir / "events.jsonl", {"type": "patchset_ready", "run_id": meta.get("run_id"), "changed_files": changed_count, "patchset_path": patch_rel, "ts": time.time()})
         append_jsonl(run_dir / "events.jsonl", {"type": "awaiting_review", "run_id": meta.get("run_id"), "ts": time.time()})
         res = envelope(True, data={"run_id": meta.get("run_id"), "plan_id": meta.get("plan_id"), "status": "awaiting_review"})
     else:
         meta.update({"status": "failed", "updated_at": time.time()})
-        write_json(run_dir / "meta.json", meta)
+        write_json(run_dir / "meta.json", meta, indent=2)
         append_jsonl(run_dir / "events.jsonl", {"type": "run_done", "run_id": meta.get("run_id"), "status": "failed", "passed": False, "ts": time.time()})
         res = envelope(False, error="rework failed")
     update_run_status(root, run_dir.name, meta.get("status", "unknown"))
@@ -301,7 +301,7 @@ def cmd_apply(args, root: Path):
     results = apply_patchset(Path(stage_root), Path(main_root), changed_files)
     StageWorkspaceManager(root).remove_stage(Path(stage_root), Path(main_root))
     meta.update({"status": "done", "apply_results": results, "updated_at": time.time()})
-    write_json(run_dir / "meta.json", meta)
+    write_json(run_dir / "meta.json", meta, indent=2)
     append_jsonl(run_dir / "events.jsonl", {"type": "apply_done", "run_id": meta.get("run_id"), "ts": time.time(), "status": "done"})
     append_jsonl(run_dir / "events.jsonl", {"type": "run_done", "run_id": meta.get("run_id"), "status": "done", "passed": True, "ts": time.time()})
     res = envelope(
@@ -330,7 +330,7 @@ def cmd_discard(args, root: Path):
     if stage_root and main_root:
         StageWorkspaceManager(root).remove_stage(Path(stage_root), Path(main_root))
     meta.update({"status": "discarded", "updated_at": time.time()})
-    write_json(run_dir / "meta.json", meta)
+    write_json(run_dir / "meta.json", meta, indent=2)
     append_jsonl(run_dir / "events.jsonl", {"type": "discard_done", "run_id": meta.get("run_id"), "status": "discarded", "ts": time.time()})
     append_jsonl(run_dir / "events.jsonl", {"type": "run_done", "run_id": meta.get("run_id"), "status": "discarded", "passed": False, "ts": time.time()})
     res = envelope(
@@ -114,10 +114,26 @@ class CodeGraph:
                     graph._edges.add((src, dst, etype))
         return graph
 
-    # 保存，写入文件内容，创建目录
+    # 保存，写入文件内容，创建目录；指纹另存到 .fpr 旁路文件
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        sidecar = path.with_suffix(".fpr")
+        if self.fingerprint is not None:
+            sidecar.write_text(self.fingerprint, encoding="utf-8")
+        elif sidecar.exists():
+            sidecar.unlink()
+
+    # 读取已保存图的指纹：优先读 .fpr 旁路文件，缺失或过期时回退到完整加载
+    @classmethod
+    def read_fingerprint(cls, path: Path) -> str | None:
+        sidecar = path.with_suffix(".fpr")
+        try:
+            if sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                return sidecar.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            pass
+        return cls.load(path).fingerprint
 
     # todict
     def to_dict(self) -> dict:
@@ -689,6 +705,9 @@ class CodeGraphService:
     def save(self, graph: CodeGraph, path: Path) -> None:
         graph.save(path)
 
+    def read_fingerprint(self, path: Path) -> str | None:
+        return CodeGraph.read_fingerprint(path)
+
     def _workspace_key(self, workspace_path: Path) -> str:
         return str(workspace_path.resolve())
 
@@ -9,6 +9,13 @@ from pathlib import Path
 from shutil import which
 from typing import Callable, Sequence
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional: fall back to polling the tailed file
+    FileSystemEventHandler = None
+    Observer = None
+
 
 if os.name == "nt":
     try:
@@ -19,6 +26,33 @@ if os.name == "nt":
         pass
 
 
+# Upper bound for tail loop waits; a file watcher, when available, only wakes them sooner.
+_TAIL_POLL_INTERVAL = 0.1
+
+
+def watch_file_changes(path: Path, changed: threading.Event):
+    """Set `changed` on any event touching `path` (incl. replace); returns the started observer or None."""
+    if Observer is None or not path.parent.is_dir():
+        return None
+    target = os.path.normcase(os.path.abspath(path))
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event) -> None:
+            for candidate in (event.src_path, getattr(event, "dest_path", "")):
+                if candidate and os.path.normcase(os.path.abspath(candidate)) == target:
+                    changed.set()
+                    return
+
+    observer = Observer()
+    observer.schedule(_Handler(), str(path.parent), recursive=False)
+    observer.daemon = True
+    try:
+        observer.start()
+    except Exception:
+        return None
+    return observer
+
+
 def normalize_cmd_path(cmd: str) -> str:
     raw = str(cmd)
     if os.name == "nt" and raw.startswith("\\\\?\\"):
@@ -26,11 +60,26 @@ def normalize_cmd_path(cmd: str) -> str:
     return raw
 
 
+# Successful PATH lookups keyed on the PATH value; misses are not stored so a later install is found.
+_CODEX_BIN_CACHE: dict[str | None, Path] = {}
+
+
 def find_codex_bin() -> Path | None:
     explicit = os.environ.get("CODEX_BIN")
     if explicit:
         return Path(normalize_cmd_path(explicit))
 
+    path_env = os.environ.get("PATH")
+    cached = _CODEX_BIN_CACHE.get(path_env)
+    if cached is not None:
+        return cached
+    found = _lookup_codex_on_path()
+    if found is not None:
+        _CODEX_BIN_CACHE[path_env] = found
+    return found
+
+
+def _lookup_codex_on_path() -> Path | None:
     candidate = which("codex")
     if candidate:
         return Path(normalize_cmd_path(candidate))
@@ -112,13 +161,12 @@ def run_codex_with_files(
 
     stderr_lines: list[str] = []
     stdout_content: list[str] = []
+    # 单个引用的读写在 CPython 下是原子的，无需加锁；读到稍旧的值最多推迟一个 select 周期
     last_activity: float | None = None  # 初始为 None，表示还没有任何输出
-    activity_lock = threading.Lock()
 
     def update_activity(ts: float) -> None:
         nonlocal last_activity
-        with activity_lock:
-            last_activity = ts
+        last_activity = ts
         if on_activity:
             try:
                 on_activity(ts)
@@ -126,10 +174,10 @@ def run_codex_with_files(
                 pass
 
     def get_idle_seconds() -> float:
-        with activity_lock:
-            if last_activity is None:
-                return 0.0  # 还没有任何输出，不算 idle
-            return time.time() - last_activity
+        last = last_activity
+        if last is None:
+            return 0.0  # 还没有任何输出，不算 idle
+        return time.time() - last
 
     use_selector = os.name != "nt"
     is_windows = not use_selector
@@ -163,6 +211,9 @@ def run_codex_with_files(
             errors="replace",
             bufsize=1,
             env=clean_env,
+            # POSIX only: fds opened by Python are non-inheritable already, and this lets CPython
+            # use posix_spawn. Windows has no posix_spawn, so keep the default there.
+            close_fds=os.name == "nt",
         )
 
         if use_selector:
@@ -182,25 +233,34 @@ def run_codex_with_files(
                     except Exception:
                         pass
 
+            stderr_changed = threading.Event()
+            stderr_observer = watch_file_changes(stderr_path, stderr_changed)
+
             def _tail_stderr_file() -> None:
                 buffer = ""
-                with stderr_path.open("r", encoding="utf-8", errors="replace") as fh:
-                    while True:
-                        chunk = fh.read()
-                        if chunk:
-                            buffer += chunk
-                            while "\n" in buffer:
-                                line, buffer = buffer.split("\n", 1)
-                                _handle_stderr_line(line)
-                        else:
-                            if proc.poll() is not None:
-                                if buffer:
-                                    _handle_stderr_line(buffer)
-                                    buffer = ""
-                                break
-                            time.sleep(0.1)
-                    if buffer:
-                        _handle_stderr_line(buffer)
+                try:
+                    with stderr_path.open("r", encoding="utf-8", errors="replace") as fh:
+                        while True:
+                            stderr_changed.clear()
+                            chunk = fh.read()
+                            if chunk:
+                                buffer += chunk
+                                while "\n" in buffer:
+                                    line, buffer = buffer.split("\n", 1)
+                                    _handle_stderr_line(line)
+                            else:
+                                if proc.poll() is not None:
+                                    if buffer:
+                                        _handle_stderr_line(buffer)
+                                        buffer = ""
+                                    break
+                                # Windows may not report writes to a file codex keeps open, so stay bounded.
+                                stderr_changed.wait(_TAIL_POLL_INTERVAL)
+                        if buffer:
+                            _handle_stderr_line(buffer)
+                finally:
+                    if stderr_observer:
+                        stderr_observer.stop()
 
             stderr_thread = threading.Thread(target=_tail_stderr_file, daemon=True)
             stderr_thread.start()
@@ -249,9 +309,8 @@ def run_codex_with_files(
                 # 区分两种情况：
                 # 1. 还没有任何输出（启动阶段）→ 检查 startup_timeout
                 # 2. 已有输出后停止输出 → 检查 idle_timeout
-                with activity_lock:
-                    has_output = last_activity is not None
-                
+                has_output = last_activity is not None
+
                 if not has_output:
                     # 启动阶段：检查是否超过 startup_timeout
                     if elapsed > startup_timeout:
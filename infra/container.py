@@ -3,9 +3,13 @@
 from dataclasses import dataclass
 from enum import Enum
 import inspect
+import threading
 from typing import Any, Callable, get_args, get_origin, get_type_hints
 
 
+_MISSING = object()
+
+
 class Lifetime(str, Enum):
     SINGLETON = "singleton"
 
@@ -21,13 +25,15 @@ class Container:
     def __init__(self) -> None:
         self._registrations: dict[type, _Registration] = {}
         self._singletons: dict[type, Any] = {}
+        # Re-entrant: building a singleton resolves its own dependencies.
+        self._lock = threading.RLock()
 
     # 注册依赖
     def register(self, interface: type, implementation: Any, lifetime: Lifetime = Lifetime.SINGLETON) -> None:
-        if callable(implementation) and not inspect.isclass(implementation):
-            factory = implementation
-        elif inspect.isclass(implementation):
+        if isinstance(implementation, type):
             factory = lambda: self._build(implementation)
+        elif callable(implementation):
+            factory = implementation
         else:
             self._singletons[interface] = implementation
             return
@@ -40,15 +46,20 @@ class Container:
             args = [arg for arg in get_args(interface) if arg is not type(None)]
             if len(args) == 1:
                 interface = args[0]
-        if interface in self._singletons:
-            return self._singletons[interface]
-        registration = self._registrations.get(interface)
-        if not registration:
-            raise KeyError(f"No registration for {interface}")
-        instance = registration.factory()
-        if registration.lifetime == Lifetime.SINGLETON:
-            self._singletons[interface] = instance
-        return instance
+        instance = self._singletons.get(interface, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        with self._lock:
+            instance = self._singletons.get(interface, _MISSING)
+            if instance is not _MISSING:
+                return instance
+            registration = self._registrations.get(interface)
+            if not registration:
+                raise KeyError(f"No registration for {interface}")
+            instance = registration.factory()
+            if registration.lifetime == Lifetime.SINGLETON:
+                self._singletons[interface] = instance
+            return instance
 
     # 构建实例
     def _build(self, cls: type) -> Any:
@@ -2,25 +2,24 @@ from __future__ import annotations
 
 from typing import Mapping, Any
 
+_TASK_KEYS = ("task_id", "step_id", "id")
+_WORKSPACE_KEYS = ("workspace", "workspace_main_root", "workspace_path")
 
-def _coerce_text(value: Any) -> str | None:
-    if isinstance(value, str):
-        stripped = value.strip()
-        return stripped if stripped else None
+
+def _first_text(obj: Mapping[str, Any], keys: tuple[str, ...]) -> str | None:
+    get = obj.get
+    for key in keys:
+        value = get(key)
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped:
+                return stripped
     return None
 
 
 def get_task_id(obj: Mapping[str, Any]) -> str | None:
-    for key in ("task_id", "step_id", "id"):
-        value = _coerce_text(obj.get(key))
-        if value:
-            return value
-    return None
+    return _first_text(obj, _TASK_KEYS)
 
 
 def get_workspace(obj: Mapping[str, Any]) -> str | None:
-    for key in ("workspace", "workspace_main_root", "workspace_path"):
-        value = _coerce_text(obj.get(key))
-        if value:
-            return value
-    return None
+    return _first_text(obj, _WORKSPACE_KEYS)
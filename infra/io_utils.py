@@ -1,30 +1,103 @@
 import json
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is absent
+    orjson = None
+
+
+# 序列化为紧凑 UTF-8 字节，优先使用 orjson
+def json_dumps_bytes(data: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# 解析JSON文本或字节，优先使用 orjson
+def json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 # 读取JSON，解析JSON，读取文件内容
 def read_json(path: str | Path, default: Any = None) -> Any:
-    path = Path(path)
+    path = path if isinstance(path, Path) else Path(path)
     if not path.exists():
         return default
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+_KNOWN_DIRS: set[Path] = set()
+
+
+# 创建父目录；已确认存在的目录不再重复 mkdir
+def _ensure_dir(directory: Path) -> None:
+    if directory in _KNOWN_DIRS:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _KNOWN_DIRS.add(directory)
+
+
+# 原子写入：先写临时文件再 os.replace，读者不会看到半截文件；durable 时额外 fsync
+def write_bytes_atomic(path: str | Path, payload: bytes, *, durable: bool = False) -> None:
+    path = path if isinstance(path, Path) else Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # Windows refuses to replace a file another process holds open; fall back to an in-place write.
+        tmp.unlink(missing_ok=True)
+        path.write_bytes(payload)
+
+
+# 序列化为写盘用的字节
+def _encode_json(data: Any, indent: int | None) -> bytes:
+    if indent is None:
+        # Machine-read files: compact output keeps to the C encoders and shrinks the file.
+        return json_dumps_bytes(data)
+    if indent == 2 and orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+
+
 # 写入JSON，序列化JSON，写入文件内容
-def write_json(path: str | Path, data: Any, *, indent: int = 2) -> None:
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = json.dumps(data, indent=indent, ensure_ascii=False)
-    path.write_text(payload, encoding="utf-8")
+def write_json(path: str | Path, data: Any, *, indent: int | None = None, durable: bool = False) -> None:
+    path = path if isinstance(path, Path) else Path(path)
+    payload = _encode_json(data, indent)
+    _ensure_dir(path.parent)
+    try:
+        write_bytes_atomic(path, payload, durable=durable)
+    except FileNotFoundError:
+        # 目录在缓存之后被删除（例如 cleanup），重新创建后重试
+        _KNOWN_DIRS.discard(path.parent)
+        _ensure_dir(path.parent)
+        write_bytes_atomic(path, payload, durable=durable)
 
 
 # 追加JSONL，创建目录，读取文件
 def append_jsonl(path: str | Path, data: Any) -> None:
-    path = Path(path)
+    path = path if isinstance(path, Path) else Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    with path.open("ab") as f:
+        f.write(json_dumps_bytes(data) + b"\n")
 
 
 # 加载JSON，读取文件内容
@@ -33,5 +106,5 @@ def load_json(path: str | Path) -> Any:
 
 
 # 保存JSON，写入文件内容
-def save_json(path: str | Path, data: Any, *, indent: int = 2) -> None:
+def save_json(path: str | Path, data: Any, *, indent: int | None = None) -> None:
     write_json(path, data, indent=indent)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from infra.io_utils import read_json
+from infra.io_utils import json_loads, read_json
 
 
 def read_json_dict(path: Path) -> dict[str, Any]:
@@ -11,9 +11,21 @@ def read_json_dict(path: Path) -> dict[str, Any]:
     return data if isinstance(data, dict) else {}
 
 
-def read_backlog_tasks(path: Path) -> list[dict[str, Any]]:
-    backlog = read_json(path, default={"tasks": []})
+def _backlog_tasks(backlog: dict[str, Any]) -> list[dict[str, Any]]:
     tasks = backlog.get("tasks", [])
     if isinstance(tasks, list):
         return [task for task in tasks if isinstance(task, dict)]
     return []
+
+
+def read_backlog_tasks(path: Path) -> list[dict[str, Any]]:
+    return _backlog_tasks(read_json(path, default={"tasks": []}))
+
+
+def read_backlog_entry(path: Path) -> tuple[list[dict[str, Any]], bytes | None]:
+    """Like read_backlog_tasks, but also return the raw file bytes (None if unreadable)."""
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return [], None
+    return _backlog_tasks(json_loads(raw)), raw
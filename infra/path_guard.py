@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -9,6 +10,12 @@ def _normalize_path(path: Path) -> str:
     return raw.lower() if os.name == "nt" else raw
 
 
+# 引擎根目录在进程内固定，只缓存它的规范化结果；候选路径每次都重新 resolve
+@lru_cache(maxsize=8)
+def _normalize_root(root: Path) -> str:
+    return _normalize_path(root)
+
+
 def normalize_path(value: Path | str | None) -> str | None:
     if value is None:
         return None
@@ -16,9 +23,7 @@ def normalize_path(value: Path | str | None) -> str | None:
     return _normalize_path(path_obj)
 
 
-def is_path_under(base: Path, candidate: Path) -> bool:
-    base_norm = _normalize_path(base)
-    cand_norm = _normalize_path(candidate)
+def _is_norm_under(base_norm: str, cand_norm: str) -> bool:
     if cand_norm == base_norm:
         return True
     if not base_norm.endswith(os.sep):
@@ -26,5 +31,10 @@ def is_path_under(base: Path, candidate: Path) -> bool:
     return cand_norm.startswith(base_norm)
 
 
+def is_path_under(base: Path, candidate: Path) -> bool:
+    return _is_norm_under(_normalize_path(base), _normalize_path(candidate))
+
+
 def is_workspace_unsafe(root: Path, workspace: Path) -> bool:
-    return is_path_under(workspace, root)
+    root_norm = _normalize_root(root) if root.is_absolute() else _normalize_path(root)
+    return _is_norm_under(_normalize_path(workspace), root_norm)
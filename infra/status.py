@@ -6,9 +6,33 @@ class StatusSet:
     TERMINAL = frozenset({"done", "failed", "canceled", "discarded"})
 
 
+_RUNNING = 1
+_TERMINAL = 2
+
+
+# 由 StatusSet 生成状态位表，避免两处手工维护
+def _build_status_mask() -> dict[str, int]:
+    mask: dict[str, int] = {}
+    for bit, statuses in ((_RUNNING, StatusSet.RUNNING), (_TERMINAL, StatusSet.TERMINAL)):
+        for status in statuses:
+            mask[status] = mask.get(status, 0) | bit
+    return mask
+
+
+_STATUS_MASK = _build_status_mask()
+
+
+def _status_mask(status: str) -> int:
+    mask = _STATUS_MASK.get(status)
+    if mask is None:
+        # Fall back to case folding only for values not already in canonical form.
+        mask = _STATUS_MASK.get((status or "").lower(), 0)
+    return mask
+
+
 def is_running(status: str) -> bool:
-    return (status or "").lower() in StatusSet.RUNNING
+    return _status_mask(status) & _RUNNING != 0
 
 
 def is_terminal(status: str) -> bool:
-    return (status or "").lower() in StatusSet.TERMINAL
+    return _status_mask(status) & _TERMINAL != 0
@@ -1,8 +1,14 @@
 import argparse
+import hashlib
 import json
+import os
 import re
-import subprocess
+import string
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from state import (
@@ -10,17 +16,12 @@ from state import (
     DEFAULT_STALE_SECONDS,
     scan_backlog_for_stale,
 )
-from infra.codex_runner import run_codex_with_files
-from infra.io_utils import read_json, write_json
-from infra.json_utils import read_backlog_tasks
-from services.profile_service import DEFAULT_ALLOWED_COMMANDS, compute_fingerprint
-from config import DEFAULT_DENY_COMMANDS, DEFAULT_DENY_WRITE
+from infra.codex_runner import run_codex_with_files, watch_file_changes
+from infra.io_utils import json_dumps_bytes, json_loads, read_json, write_bytes_atomic, write_json
+from infra.json_utils import read_backlog_entry
+from config import DEFAULT_ALLOWED_COMMANDS, DEFAULT_DENY_COMMANDS, DEFAULT_DENY_WRITE
 from policy_validator import validate_checks, default_path_rules, is_safe_relative_path
-from detect_workspace import detect_workspace
-from engine.project_context import ProjectContext
-from services.code_graph_service import CodeGraphService
-from services.controller.workspace import auto_select_workspace
-from services.profile_service import ProfileService
+from services.controller.backlog import list_backlog_files
 from infra.path_guard import is_workspace_unsafe
 from workspace_utils import (
     compute_workspace_id,
@@ -30,85 +31,229 @@ from workspace_utils import (
 )
 from sqlite_mirror import mirror_plan
 
-
-# 合并任务
-def _merge_tasks(tasks: list[dict]) -> list[dict]:
-    by_id: dict[str, dict] = {}
+_OUTPUTS_RE = re.compile(r"(?:run_dir/)?outputs/([A-Za-z0-9_./-]+)")
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+_TOKEN_RE = re.compile(r"[A-Za-z0-9._/\\-]+")
+_EXEC_CHECK_TYPES = frozenset({"command", "command_contains", "http_check"})
+_PATH_CHECK_TYPES = frozenset({"file_exists", "file_contains", "json_schema"})
+# 新写入 backlog 的任务记录的字段与顺序；逐任务变化的值在循环里覆盖
+_BACKLOG_TASK_TEMPLATE: dict[str, object | None] = {
+    "id": None,
+    "step_id": None,
+    "title": None,
+    "description": "",
+    "capabilities": None,
+    "artifacts": None,
+    "type": "time_for_certainty",
+    "priority": 50,
+    "estimated_minutes": 30,
+    "status": "todo",
+    "dependencies": None,
+    "acceptance_criteria": None,
+    "checks": None,
+    "validation_reasons": None,
+    "plan_id": None,
+    "created_ts": None,
+    "status_ts": None,
+}
+
+
+# 按 id 合并任务到 by_id，doing 状态优先
+def _upsert_tasks(by_id: dict[str, dict], tasks: list[dict]) -> None:
     for t in tasks:
         tid = t.get("id")
         if not tid:
             continue
         prev = by_id.get(tid)
-        if not prev:
-            by_id[tid] = t
-            continue
-        if prev.get("status") != "doing" and t.get("status") == "doing":
+        if prev is None or (t.get("status") == "doing" and prev.get("status") != "doing"):
             by_id[tid] = t
+
+
+# 合并任务
+def _merge_tasks(tasks: list[dict]) -> list[dict]:
+    by_id: dict[str, dict] = {}
+    _upsert_tasks(by_id, tasks)
     return list(by_id.values())
 
 
 # 列出待办files，检查路径是否存在
 def _list_backlog_files(root: Path) -> list[Path]:
-    backlog_files: list[Path] = []
-    default_dir = root / "backlog"
-    if default_dir.exists():
-        backlog_files.extend(default_dir.glob("*.json"))
+    return list_backlog_files(root)
+
+
+_BACKLOG_IO_WORKERS = 8
+_BACKLOG_IO_POOL: ThreadPoolExecutor | None = None
+
+
+# 共享的待办读写线程池，避免每次加载都重新创建线程
+def _backlog_io_pool() -> ThreadPoolExecutor:
+    global _BACKLOG_IO_POOL
+    if _BACKLOG_IO_POOL is None:
+        _BACKLOG_IO_POOL = ThreadPoolExecutor(max_workers=_BACKLOG_IO_WORKERS, thread_name_prefix="backlog-io")
+    return _BACKLOG_IO_POOL
+
+
+class BacklogCache:
+    """Parsed backlog files keyed by path, valid while (st_mtime_ns, st_size) is unchanged.
+
+    Each entry also keeps a digest of the bytes last read or written, so
+    unchanged files can be skipped on write.
+
+    Loaders hand out the cached lists themselves, not copies. A caller that
+    mutates them in place (e.g. scan_backlog_for_stale via transition_task)
+    must write the map back with _write_backlog_map, or forget the entries
+    if it cannot, so the cache never diverges from the file on disk.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[int, int, list[dict], bytes | None]] = {}
+
+    def get(self, path: Path, st: os.stat_result) -> list[dict] | None:
+        cached = self._entries.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        return None
 
-    workspace_root = root / "artifacts" / "workspaces"
-    if workspace_root.exists():
-        for ws_dir in workspace_root.iterdir():
-            if not ws_dir.is_dir():
-                continue
-            ws_backlog = ws_dir / "backlog"
-            if not ws_backlog.exists():
-                continue
-            backlog_files.extend(ws_backlog.glob("*.json"))
+    def put(self, path: Path, st: os.stat_result, tasks: list[dict], digest: bytes | None = None) -> None:
+        self._entries[path] = (st.st_mtime_ns, st.st_size, tasks, digest)
 
-    return sorted(backlog_files)
+    # 文件未被外部改动时，返回上次读写内容的摘要
+    def digest(self, path: Path) -> bytes | None:
+        cached = self._entries.get(path)
+        if not cached or cached[3] is None:
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[3]
+        return None
+
+    # 写入后记录，避免下一次加载重新解析
+    def remember(self, path: Path, tasks: list[dict], digest: bytes | None = None) -> None:
+        try:
+            st = path.stat()
+        except OSError:
+            self._entries.pop(path, None)
+            return
+        self.put(path, st, tasks, digest)
+
+    def forget(self, path: Path) -> None:
+        self._entries.pop(path, None)
+
+    def retain(self, paths) -> None:
+        for stale in self._entries.keys() - set(paths):
+            del self._entries[stale]
+
+
+_BACKLOG_CACHE = BacklogCache()
+
+
+def _content_digest(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=8).digest()
+
+
+# 读取单个待办文件，同时返回原始字节的摘要
+def _read_backlog_entry(path: Path) -> tuple[list[dict], bytes | None]:
+    tasks, raw = read_backlog_entry(path)
+    return tasks, _content_digest(raw) if raw is not None else None
 
 
 # 加载待办map，读取文件内容
 def _load_backlog_map(root: Path) -> dict[Path, list[dict]]:
     backlog_map: dict[Path, list[dict]] = {}
+    misses: list[tuple[Path, os.stat_result]] = []
     for path in _list_backlog_files(root):
-        backlog_map[path] = read_backlog_tasks(path)
+        try:
+            st = path.stat()
+        except OSError:
+            _BACKLOG_CACHE.forget(path)
+            continue
+        cached = _BACKLOG_CACHE.get(path, st)
+        if cached is not None:
+            backlog_map[path] = cached
+        else:
+            backlog_map[path] = []  # placeholder keeps the sorted file order
+            misses.append((path, st))
+    if len(misses) > 1:
+        loaded = list(_backlog_io_pool().map(_read_backlog_entry, [path for path, _ in misses]))
+    else:
+        loaded = [_read_backlog_entry(path) for path, _ in misses]
+    for (path, st), (tasks, digest) in zip(misses, loaded):
+        _BACKLOG_CACHE.put(path, st, tasks, digest)
+        backlog_map[path] = tasks
+    _BACKLOG_CACHE.retain(backlog_map)
     return backlog_map
 
 
-# 写入待办map，写入文件内容
-def _write_backlog_map(backlog_map: dict[Path, list[dict]]) -> None:
-    for path, tasks in backlog_map.items():
-        write_json(path, {"tasks": tasks})
+# 内容与上次读写一致时跳过写入
+def _write_backlog_file(item: tuple[Path, list[dict]]) -> None:
+    path, tasks = item
+    payload = json_dumps_bytes({"tasks": tasks})
+    digest = _content_digest(payload)
+    if digest == _BACKLOG_CACHE.digest(path):
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_bytes_atomic(path, payload)
+    _BACKLOG_CACHE.remember(path, tasks, digest)
 
 
-# 加载active待办
-def _load_active_backlog(root: Path) -> dict:
-    backlog_map = _load_backlog_map(root)
-    merged = _merge_tasks([t for tasks in backlog_map.values() for t in tasks])
-    return {"tasks": merged}
+# 写入待办map，写入文件内容
+def _write_backlog_map(backlog_map: dict[Path, list[dict]]) -> None:
+    items = list(backlog_map.items())
+    if len(items) > 1:
+        list(_backlog_io_pool().map(_write_backlog_file, items))
+    else:
+        for item in items:
+            _write_backlog_file(item)
+
+
+# 单个待办文件的 (mtime_ns, size) 签名，用于判断是否需要重新读取
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
-# split任务by计划
-def _split_tasks_by_plan(tasks: list[dict]) -> tuple[list[dict], dict[str, list[dict]]]:
-    non_plan: list[dict] = []
-    by_plan: dict[str, list[dict]] = {}
-    for t in tasks:
-        plan_id = t.get("plan_id")
-        if plan_id:
-            by_plan.setdefault(plan_id, []).append(t)
-        else:
-            non_plan.append(t)
-    return non_plan, by_plan
+# 只加载当前计划自己的待办文件；controller 按 plan_id 运行时也只读这个文件
+def _load_plan_backlog(path: Path) -> dict:
+    try:
+        st = path.stat()
+    except OSError:
+        return {"tasks": []}
+    tasks = _BACKLOG_CACHE.get(path, st)
+    if tasks is None:
+        tasks, digest = _read_backlog_entry(path)
+        _BACKLOG_CACHE.put(path, st, tasks, digest)
+    return {"tasks": tasks}
 
 
-# 写入计划snapshot，写入文件内容，创建目录
-def _write_plan_snapshot(root: Path, workspace: str | Path | None, plan_id: str, stop_reason: str) -> None:
-    backlog_map = _load_backlog_map(root)
-    tasks = []
-    for entries in backlog_map.values():
-        for t in entries:
-            if t.get("plan_id") == plan_id:
-                tasks.append(t)
+# 按 plan_id 索引待办任务及其所在文件
+def _index_by_plan(backlog_map: dict[Path, list[dict]]) -> dict[str, list[tuple[Path, dict]]]:
+    index: dict[str, list[tuple[Path, dict]]] = {}
+    for path, tasks in backlog_map.items():
+        for t in tasks:
+            plan_id = t.get("plan_id")
+            if plan_id:
+                index.setdefault(plan_id, []).append((path, t))
+    return index
+
+
+# 基于已加载的待办map写入计划snapshot
+def _write_plan_snapshot_from_map(
+    root: Path,
+    workspace: str | Path | None,
+    plan_id: str,
+    stop_reason: str,
+    backlog_map: dict[Path, list[dict]],
+    plan_index: dict[str, list[tuple[Path, dict]]] | None = None,
+) -> None:
+    if plan_index is None:
+        plan_index = _index_by_plan(backlog_map)
+    tasks = [t for _, t in plan_index.get(plan_id, ())]
     snapshot = {
         "plan_id": plan_id,
         "snapshot_ts": time.time(),
@@ -117,7 +262,7 @@ def _write_plan_snapshot(root: Path, workspace: str | Path | None, plan_id: str,
     }
     exec_dir = get_plan_dir(root, workspace, plan_id)
     exec_dir.mkdir(parents=True, exist_ok=True)
-    write_json(exec_dir / "snapshot.json", snapshot)
+    write_json(exec_dir / "snapshot.json", snapshot, durable=True)
 
 
 # 运行codex计划，执行外部命令
@@ -133,31 +278,30 @@ def run_codex_plan(prompt: str, root_dir: Path, workspace: Path | None = None) -
     )
 
 
-# 判断是否包含todo
-def has_todo(backlog: dict, plan_id: str) -> bool:
-    for t in backlog.get("tasks", []):
-        if t.get("plan_id") == plan_id and t.get("status") == "todo":
-            return True
-    return False
-
-
-# 判断是否包含runnable
-def has_runnable(backlog: dict, plan_id: str) -> bool:
-    tasks = backlog.get("tasks", [])
-    done = {t["id"] for t in tasks if t.get("plan_id") == plan_id and t.get("status") == "done"}
+# 单次扫描计划任务，返回 (has_todo, has_runnable)
+def _scan_plan_state(backlog: dict, plan_id: str) -> tuple[bool, bool]:
+    tasks = [t for t in backlog.get("tasks", []) if t.get("plan_id") == plan_id]
+    done: set = set()
+    pending: list[list] = []
     for t in tasks:
-        if t.get("plan_id") != plan_id or t.get("status") != "todo":
-            continue
-        deps = t.get("dependencies", [])
-        if any(dep not in done for dep in deps):
-            continue
-        return True
-    return False
+        status = t.get("status")
+        if status == "todo":
+            deps = t.get("dependencies")
+            if not deps:
+                # 无依赖的 todo 一定可运行，无需等待 done 集合构建完成
+                return True, True
+            pending.append(deps)
+        elif status == "done":
+            done.add(t["id"])
+    if not pending:
+        return False, False
+    runnable = any(all(dep in done for dep in deps) for deps in pending)
+    return True, runnable
 
 
 # extract输出路径
 def _extract_outputs_path(text: str) -> list[str]:
-    matches = re.findall(r"(?:run_dir/)?outputs/([A-Za-z0-9_./-]+)", text)
+    matches = _OUTPUTS_RE.findall(text)
     return [f"outputs/{m}" for m in matches]
 
 
@@ -167,7 +311,7 @@ def _extract_needle(text: str) -> str | None:
         if kw in text:
             after = text.split(kw, 1)[1].strip(" ：:，,。.")
             # Prefer quoted content if present.
-            m = re.search(r"['\"]([^'\"]+)['\"]", after)
+            m = _QUOTED_RE.search(after)
             if m:
                 return m.group(1).strip()
             return after.strip() or None
@@ -178,8 +322,11 @@ def _extract_needle(text: str) -> str | None:
 def derive_checks_from_acceptance(acceptance: list[str]) -> list[dict]:
     checks: list[dict] = []
     for line in acceptance or []:
-        for path in _extract_outputs_path(line):
-            needle = _extract_needle(line)
+        paths = _extract_outputs_path(line)
+        if not paths:
+            continue
+        needle = _extract_needle(line)
+        for path in paths:
             if needle:
                 checks.append({"type": "file_contains", "path": path, "needle": needle})
             else:
@@ -189,10 +336,7 @@ def derive_checks_from_acceptance(acceptance: list[str]) -> list[dict]:
 
 # 判断是否包含execution检查
 def _has_execution_check(checks: list[dict]) -> bool:
-    for check in checks or []:
-        if check.get("type") in {"command", "command_contains", "http_check"}:
-            return True
-    return False
+    return any(check.get("type") in _EXEC_CHECK_TYPES for check in checks or ())
 
 
 # 合并检查项
@@ -209,7 +353,7 @@ def _extract_safe_path(value: str) -> str | None:
         return None
     if is_safe_relative_path(value):
         return value
-    for token in re.findall(r"[A-Za-z0-9._/\\-]+", value):
+    for token in _TOKEN_RE.findall(value):
         if is_safe_relative_path(token):
             return token
     return None
@@ -221,7 +365,7 @@ def _normalize_checks(checks: list[dict]) -> list[dict]:
         if not isinstance(check, dict):
             continue
         ctype = check.get("type")
-        if ctype in {"file_exists", "file_contains", "json_schema"}:
+        if ctype in _PATH_CHECK_TYPES:
             raw_path = check.get("path", "")
             safe_path = _extract_safe_path(raw_path)
             if safe_path:
@@ -232,6 +376,30 @@ def _normalize_checks(checks: list[dict]) -> list[dict]:
 
 
 
+# 解析模板一次，按文件 mtime 失效
+@lru_cache(maxsize=8)
+def _compile_template(path_str: str, mtime_ns: int) -> tuple[tuple[str, str | None, str | None, str | None], ...]:
+    text = Path(path_str).read_text(encoding="utf-8")
+    return tuple(string.Formatter().parse(text))
+
+
+# 渲染模板，等价于 str.format(**values)
+def _render_template(path: Path, **values) -> str:
+    parts = _compile_template(str(path), path.stat().st_mtime_ns)
+    out: list[str] = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is None:
+            continue
+        value = values[field]
+        if conversion == "r":
+            value = repr(value)
+        elif conversion == "a":
+            value = ascii(value)
+        out.append(format(value, spec or ""))
+    return "".join(out)
+
+
 # build readable task chain text
 def build_task_chain_text(tasks: list[dict]) -> str:
     if not tasks:
@@ -261,30 +429,44 @@ def main():
     parser.add_argument("--stale-auto-reset", action="store_true", default=DEFAULT_STALE_AUTO_RESET, help="auto reset stale tasks to todo")
     parser.add_argument("--no-stale-auto-reset", action="store_true", help="disable auto reset even if env enables it")
     parser.add_argument("--mode", default="autopilot", choices=["autopilot", "manual"], help="run mode")
+    parser.add_argument("--isolate-controller", action="store_true", help="run controller steps in a separate worker process")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds to wait for backlog changes when a controller step makes no progress")
     args = parser.parse_args()
     root = Path(args.root).resolve()
     workspace_path = None
-    profile_service = ProfileService()
-    code_graph_service = CodeGraphService(cache_root=root)
 
     plan_id = args.plan_id or time.strftime("plan-%Y%m%d-%H%M%S")
     user_task = args.task.strip()
 
     backlog_map = _load_backlog_map(root)
     auto_reset = args.stale_auto_reset and not args.no_stale_auto_reset
-    if scan_backlog_for_stale(backlog_map, args.stale_seconds, auto_reset, root, source="plan_and_run"):
-        _write_backlog_map(backlog_map)
-    backlog = {"tasks": _merge_tasks([t for tasks in backlog_map.values() for t in tasks])}
+    try:
+        if scan_backlog_for_stale(backlog_map, args.stale_seconds, auto_reset, root, source="plan_and_run"):
+            _write_backlog_map(backlog_map)
+    except Exception:
+        # 扫描会原地修改缓存中的任务；没能写回时丢弃这些条目，下次从文件重新读取
+        for path in backlog_map:
+            _BACKLOG_CACHE.forget(path)
+        raise
+    # 只需要全部已有 id 做冲突检测，按 id 去重的合并结果用不上
+    existing_ids = {t["id"] for tasks in backlog_map.values() for t in tasks if t.get("id")}
 
     profile = None
     hard_block = "none"
     allowed_commands = list(DEFAULT_ALLOWED_COMMANDS)
     capabilities_block = "none"
+    capabilities_data: dict | None = None
     command_blacklist = list(DEFAULT_DENY_COMMANDS or [])
     workspace_checks: list[dict] = []
     workspace_path = None
     workspace_value = None
     if args.workspace:
+        # 仅在指定 workspace 时才需要这些较重的模块
+        from engine.project_context import ProjectContext
+        from services.code_graph_service import CodeGraphService
+        from services.controller.workspace import auto_select_workspace
+        from services.profile_service import ProfileService, compute_fingerprint
+
         workspace_path = auto_select_workspace(Path(args.workspace))
         if is_workspace_unsafe(root, workspace_path):
             print(f"[POLICY] workspace path {workspace_path} includes engine root {root}; refusing to proceed.")
@@ -308,8 +490,9 @@ def main():
         if discovered:
             command_blacklist = list(DEFAULT_DENY_COMMANDS or [])
         if capabilities:
+            capabilities_data = capabilities
             capabilities_block = json.dumps(capabilities, ensure_ascii=False, indent=2)
-        profile = profile_service.ensure_profile(root, workspace_path)
+        profile = ProfileService().ensure_profile(root, workspace_path)
         effective_hard = profile.get("effective_hard") or {}
         allowed_commands = effective_hard.get("allowed_commands", allowed_commands) or allowed_commands
         hard_block = json.dumps(
@@ -326,8 +509,8 @@ def main():
         )
         print(f"[PROFILE] workspace_id={profile.get('workspace_id')} fingerprint={profile.get('fingerprint')}")
 
-    tmpl = (root / "prompts" / "plan.txt").read_text(encoding="utf-8")
-    prompt = tmpl.format(
+    prompt = _render_template(
+        root / "prompts" / "plan.txt",
         plan_id=plan_id,
         max_tasks=args.max_tasks,
         task_text=user_task,
@@ -336,29 +519,30 @@ def main():
     )
 
     raw_plan = run_codex_plan(prompt.strip(), root, workspace=workspace_path)
-    plan_obj = json.loads(raw_plan)
+    plan_obj = json_loads(raw_plan)
+    plan_tasks_in = plan_obj.get("tasks", []) or []
     task_chain_text = plan_obj.get("task_chain_text")
     if not isinstance(task_chain_text, str) or not task_chain_text.strip():
-        task_chain_text = build_task_chain_text(plan_obj.get("tasks", []))
+        task_chain_text = build_task_chain_text(plan_tasks_in)
 
     exec_dir = get_plan_dir(root, workspace_path, plan_id)
     exec_dir.mkdir(parents=True, exist_ok=True)
-    if capabilities_block != "none":
+    if capabilities_data is not None:
         try:
             workspace_field = workspace_value or (str(workspace_path) if workspace_path else args.workspace)
-            write_json(exec_dir / "capabilities.json", {"workspace": workspace_field, "capabilities": json.loads(capabilities_block)})
+            write_json(exec_dir / "capabilities.json", {"workspace": workspace_field, "capabilities": capabilities_data})
         except Exception:
             pass
     workspace_fingerprint = None
     code_graph_path = None
     if workspace_path:
         workspace_fingerprint = profile.get("fingerprint") if profile else compute_fingerprint(workspace_path)
+        code_graph_service = CodeGraphService(cache_root=root)
         graph_path = exec_dir / "code-graph.json"
         needs_build = True
         if graph_path.exists():
             try:
-                existing = code_graph_service.load(graph_path)
-                if existing.fingerprint == workspace_fingerprint:
+                if code_graph_service.read_fingerprint(graph_path) == workspace_fingerprint:
                     needs_build = False
             except Exception:
                 needs_build = True
@@ -373,95 +557,103 @@ def main():
             code_graph_path = str(graph_path)
     validation_summary = []
     tasks_record = exec_dir / "plan.tasks.jsonl"
-    with tasks_record.open("w", encoding="utf-8") as f:
-        for idx, t in enumerate(plan_obj.get("tasks", []), 1):
-            rec = {"plan_id": plan_id, **t}
-            step_id = rec.get("step_id") or rec.get("id") or f"step-{idx:02d}"
-            rec["step_id"] = step_id
-            if not isinstance(rec.get("checks"), list) or not rec.get("checks"):
-                rec["checks"] = derive_checks_from_acceptance(rec.get("acceptance_criteria", []))
-            rec["checks"] = _normalize_checks(rec.get("checks", []))
-            rec["checks"] = _merge_checks(rec.get("checks", []), workspace_checks)
-            rec["checks"], reasons = validate_checks(rec.get("checks", []), allowed_commands, command_blacklist=command_blacklist)
-            if reasons:
-                rec["validation_reasons"] = reasons
-                validation_summary.append({"task_id": rec.get("id"), "reasons": reasons})
-            workspace_entry = workspace_value if workspace_value is not None else rec.get("workspace_path")
-            if workspace_entry is not None:
-                rec["workspace_path"] = workspace_entry
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-
-
     backlog_dir = get_backlog_dir(root, workspace_path)
     backlog_dir.mkdir(parents=True, exist_ok=True)
-    existing_ids = {t["id"] for t in backlog.get("tasks", []) if t.get("id")}
     plan_backlog_path = backlog_dir / f"{plan_id}.json"
-    plan_backlog = read_json(plan_backlog_path, default={"tasks": []})
-    plan_tasks = plan_backlog.get("tasks", [])
-    for idx, t in enumerate(plan_obj.get("tasks", []), 1):
-        step_id = t.get("step_id") or f"step-{idx:02d}"
-        task_id = t.get("id") or step_id
-        if task_id in existing_ids:
-            task_id = f"{task_id}_{int(time.time())}"
-        existing_ids.add(task_id)
-
-        checks = t.get("checks", []) if isinstance(t.get("checks"), list) else []
+    # 新计划没有文件可读；已有文件且未变更时复用启动时解析的结果
+    try:
+        plan_backlog_st = plan_backlog_path.stat()
+    except OSError:
+        plan_tasks = []
+    else:
+        cached_tasks = _BACKLOG_CACHE.get(plan_backlog_path, plan_backlog_st)
+        if cached_tasks is not None:
+            plan_tasks = list(cached_tasks)
+        else:
+            plan_tasks = read_json(plan_backlog_path, default={"tasks": []}).get("tasks", [])
+    # 每个任务只推导/校验一次检查项，同时写入 plan.tasks.jsonl 和 backlog 记录
+    tasks_jsonl = bytearray()
+    now_ts = time.time()
+    id_collisions: Counter[str] = Counter()
+    # 每个任务共用的字段预先填好，键顺序即写入 backlog 的字段顺序
+    record_base = dict(_BACKLOG_TASK_TEMPLATE, plan_id=plan_id, created_ts=now_ts, status_ts=now_ts)
+    for idx, t in enumerate(plan_tasks_in, 1):
+        checks_raw = t.get("checks")
+        acceptance = t.get("acceptance_criteria", [])
+        checks = checks_raw if isinstance(checks_raw, list) else []
         if not checks:
-            checks = derive_checks_from_acceptance(t.get("acceptance_criteria", []))
+            checks = derive_checks_from_acceptance(acceptance)
         checks = _normalize_checks(checks)
         checks = _merge_checks(checks, workspace_checks)
         checks, reasons = validate_checks(checks, allowed_commands, command_blacklist=command_blacklist)
         workspace_entry = workspace_value if workspace_value is not None else t.get("workspace_path")
-        record: dict[str, object | None] = {
-            "id": task_id,
-            "step_id": step_id,
-            "title": t.get("title", f"Task {idx}"),
-            "description": t.get("description", ""),
-            "capabilities": t.get("capabilities", []),
-            "artifacts": t.get("artifacts", []),
-            "type": "time_for_certainty",
-            "priority": t.get("priority", 50),
-            "estimated_minutes": t.get("estimated_minutes", 30),
-            "status": "todo",
-            "dependencies": t.get("dependencies", []),
-            "acceptance_criteria": t.get("acceptance_criteria", []),
-            "checks": checks,
-            "validation_reasons": reasons,
-            "plan_id": plan_id,
-            "created_ts": time.time(),
-            "status_ts": time.time(),
-        }
+
+        rec = {"plan_id": plan_id, **t}
+        rec["step_id"] = rec.get("step_id") or rec.get("id") or f"step-{idx:02d}"
+        rec["checks"] = checks
+        if reasons:
+            rec["validation_reasons"] = reasons
+            validation_summary.append({"task_id": rec.get("id"), "reasons": reasons})
+        if workspace_entry is not None:
+            rec["workspace_path"] = workspace_entry
+        tasks_jsonl += json_dumps_bytes(rec)
+        tasks_jsonl += b"\n"
+
+        step_id = t.get("step_id") or f"step-{idx:02d}"
+        task_id = t.get("id") or step_id
+        if task_id in existing_ids:
+            # 递增后缀直到不冲突，同一计划内的重复 id 也能各自得到唯一值
+            base_id = task_id
+            while task_id in existing_ids:
+                id_collisions[base_id] += 1
+                task_id = f"{base_id}__{id_collisions[base_id]}"
+        existing_ids.add(task_id)
+        record: dict[str, object | None] = record_base.copy()
+        record["id"] = task_id
+        record["step_id"] = step_id
+        record["title"] = t.get("title", f"Task {idx}")
+        record["description"] = t.get("description", "")
+        record["capabilities"] = t.get("capabilities", [])
+        record["artifacts"] = t.get("artifacts", [])
+        record["priority"] = t.get("priority", 50)
+        record["estimated_minutes"] = t.get("estimated_minutes", 30)
+        record["dependencies"] = t.get("dependencies", [])
+        record["acceptance_criteria"] = acceptance
+        record["checks"] = checks
+        record["validation_reasons"] = reasons
         if workspace_entry is not None:
             record["workspace_path"] = workspace_entry
         plan_tasks.append(record)
+    tasks_record.write_bytes(tasks_jsonl)
 
     write_json(plan_backlog_path, {"tasks": plan_tasks})
-    write_json(
-        exec_dir / "plan.json",
-        {
-            "plan_id": plan_id,
-            "workspace_id": compute_workspace_id(workspace_path or workspace_value),
-            "input_task": user_task,
-            "prompt": prompt,
-            "raw_plan": plan_obj,
-            "task_chain_text": task_chain_text,
-            "validation": validation_summary,
-            "code_graph_path": code_graph_path,
-            "workspace_fingerprint": workspace_fingerprint,
-            "workspace_path": workspace_value,
-            "workspace_main_root": workspace_value,
-            "created_ts": time.time(),
-        },
-    )
+    _BACKLOG_CACHE.remember(plan_backlog_path, plan_tasks)
+    plan_file = exec_dir / "plan.json"
+    plan_data = {
+        "plan_id": plan_id,
+        "workspace_id": compute_workspace_id(workspace_path or workspace_value),
+        "input_task": user_task,
+        "prompt": prompt,
+        "raw_plan": plan_obj,
+        "task_chain_text": task_chain_text,
+        "validation": validation_summary,
+        "code_graph_path": code_graph_path,
+        "workspace_fingerprint": workspace_fingerprint,
+        "workspace_path": workspace_value,
+        "workspace_main_root": workspace_value,
+        "created_ts": now_ts,
+    }
+    write_json(plan_file, plan_data)
+    plan_file_mtime_ns = plan_file.stat().st_mtime_ns
     mirror_plan(
         root,
         plan_id,
         workspace=str(workspace_path) if workspace_path else "",
-        tasks_count=len(plan_obj.get("tasks", []) or []),
+        tasks_count=len(plan_tasks_in),
         input_task=user_task,
     )
     (exec_dir / "plan.txt").write_text(task_chain_text, encoding="utf-8")
-    print(f"[PLAN] added {len(plan_obj.get('tasks', []))} tasks to backlog under plan_id={plan_id}")
+    print(f"[PLAN] added {len(plan_tasks_in)} tasks to backlog under plan_id={plan_id}")
 
     if args.no_run:
         print("[PLAN] no-run flag set, skipping execution")
@@ -469,43 +661,72 @@ def main():
             print("[CLEANUP] skip cleanup when --no-run is set (nothing executed yet)")
         return
 
+    controller = None
+    worker = None
+    if args.isolate_controller:
+        from services.controller_service import ControllerWorker
+
+        worker = ControllerWorker(root)
+    else:
+        from services.controller_service import create_default_controller, run as run_controller
+
+        controller = create_default_controller(root)
+
     stop_reason = "unknown"
-    while True:
-        backlog = _load_active_backlog(root)
-        if not has_todo(backlog, plan_id):
-            print(f"[PLAN DONE] no todo tasks for plan_id={plan_id}")
-            stop_reason = "no_todo"
-            break
-        if not has_runnable(backlog, plan_id):
-            print(f"[PLAN STOP] todo tasks remain but no runnable tasks for plan_id={plan_id} (??????????)")
-            stop_reason = "no_runnable"
-            break
-        print(f"[RUN] invoking controller for plan_id={plan_id}")
-        cmd = ["python", "-m", "services.controller_service", "--root", str(root), "--plan-id", plan_id, "--mode", args.mode]
-        if workspace_path:
-            cmd.extend(["--workspace", str(workspace_path)])
-        subprocess.check_call(cmd, cwd=root)
-
-    _write_plan_snapshot(root, workspace_path, plan_id, stop_reason)
+    # 用独立哨兵：待办文件不存在时 _file_signature 也返回 None，首轮仍需扫描
+    state_sig: object = object()
+    backlog_changed = threading.Event()
+    # 计划任务写在它自己的 backlog 文件里；只监听该文件，没有 watchdog 时退化为定时等待
+    observer = watch_file_changes(plan_backlog_path, backlog_changed)
+    try:
+        while True:
+            sig = _file_signature(plan_backlog_path)
+            if sig != state_sig:
+                todo, runnable = _scan_plan_state(_load_plan_backlog(plan_backlog_path), plan_id)
+                state_sig = sig
+            if not todo:
+                print(f"[PLAN DONE] no todo tasks for plan_id={plan_id}")
+                stop_reason = "no_todo"
+                break
+            if not runnable:
+                print(f"[PLAN STOP] todo tasks remain but no runnable tasks for plan_id={plan_id} (??????????)")
+                stop_reason = "no_runnable"
+                break
+            print(f"[RUN] invoking controller for plan_id={plan_id}")
+            backlog_changed.clear()
+            if controller is not None:
+                run_controller(root, plan_id, args.mode, workspace_path, controller=controller)
+            else:
+                worker.run(plan_id, args.mode, workspace_path)
+            # controller 没有改动 backlog（例如在等外部依赖）时，等待文件变化或超时，而不是立即再次调用
+            if args.poll_interval > 0 and _file_signature(plan_backlog_path) == state_sig:
+                backlog_changed.wait(args.poll_interval)
+    finally:
+        if observer is not None:
+            observer.stop()
+        if worker is not None:
+            worker.close()
+
+    backlog_map = _load_backlog_map(root)
+    plan_index = _index_by_plan(backlog_map)
+    _write_plan_snapshot_from_map(root, workspace_path, plan_id, stop_reason, backlog_map, plan_index)
 
     if args.cleanup:
-        backlog_map = _load_backlog_map(root)
-        removed: list[dict] = []
-        for path, tasks in backlog_map.items():
-            keep: list[dict] = []
-            for t in tasks:
-                if t.get("plan_id") == plan_id:
-                    removed.append(t)
-                else:
-                    keep.append(t)
-            write_json(path, {"tasks": keep})
-
-        plan_file = exec_dir / "plan.json"
+        plan_entries = plan_index.get(plan_id, [])
+        removed = [t for _, t in plan_entries]
+        changed: dict[Path, list[dict]] = {}
+        for path, _ in plan_entries:
+            if path not in changed:
+                changed[path] = [t for t in backlog_map[path] if t.get("plan_id") != plan_id]
+        _write_backlog_map(changed)
+
         if plan_file.exists():
-            plan_data = read_json(plan_file, default={})
+            # 只有 plan.json 在运行期间被外部改写时才重新读取
+            if plan_file.stat().st_mtime_ns != plan_file_mtime_ns:
+                plan_data = read_json(plan_file, default={})
             plan_data["last_cleanup_ts"] = time.time()
             plan_data["cleanup_snapshot"] = removed
-            write_json(plan_file, plan_data)
+            write_json(plan_file, plan_data, durable=True)
 
         print(f"[CLEANUP] removed {len(removed)} tasks for plan_id={plan_id} (recorded in plan file)")
 
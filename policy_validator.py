@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
 
 from config import POLICY_ENFORCED
 
 ALLOWED_PATH_RE = re.compile(r"^[A-Za-z0-9._/\-]+$")
+# 一次匹配完成全部规则：非空、不以 / 开头、没有 .. 段、只含允许字符（因此也没有盘符冒号）
+SAFE_REL_PATH_RE = re.compile(r"(?!/)(?!(?:.*/)?\.\.(?:/|$))[A-Za-z0-9._/\-]+")
 
 
 # 默认路径rules
@@ -27,31 +28,16 @@ def _norm_rel_path(path: str) -> str:
 def is_safe_relative_path(path: str) -> bool:
     if not isinstance(path, str):
         return False
-    path = _norm_rel_path(path)
-    if not path:
-        return False
-    if path.startswith("/") or path.startswith("\\"):
-        return False
-    if ":" in path:
-        return False
-    parts = Path(path).parts
-    if any(p == ".." for p in parts):
-        return False
-    if not ALLOWED_PATH_RE.match(path):
-        return False
-    return True
+    return SAFE_REL_PATH_RE.fullmatch(_norm_rel_path(path)) is not None
 
 
 # 判断是否under
 def _is_under(path: str, roots: list[str]) -> bool:
     path = _norm_rel_path(path)
-    for root in roots:
-        root = _norm_rel_path(root)
-        if root == "":
-            return True
-        if path == root or path.startswith(root.rstrip("/") + "/"):
-            return True
-    return False
+    norms = [_norm_rel_path(root) for root in roots]
+    if "" in norms:
+        return True
+    return path in norms or path.startswith(tuple(root.rstrip("/") + "/" for root in norms))
 
 
 # 判断是否写入allowed
@@ -82,6 +68,8 @@ def validate_checks(
     cleaned = []
     reasons: list[dict] = []
     enforced = _policy_enforced(enforce_policy)
+    allowed_prefixes = tuple(allowed_commands)
+    blacklist_prefixes = tuple(command_blacklist or ())
     for idx, check in enumerate(checks or []):
         if not isinstance(check, dict):
             reasons.append({"type": "invalid_check", "index": idx, "reason": "not_object"})
@@ -97,7 +85,7 @@ def validate_checks(
                 continue
         if ctype in {"command", "command_contains"}:
             cmd = (check.get("cmd") or "").strip()
-            if not any(cmd.startswith(p) for p in allowed_commands):
+            if not cmd.startswith(allowed_prefixes):
                 reasons.append({"type": "command_not_allowed", "index": idx, "cmd": cmd, "expected": allowed_commands})
                 if enforced:
                     continue
@@ -105,8 +93,8 @@ def validate_checks(
                 if cmd not in command_whitelist:
                     reasons.append({"type": "command_not_in_whitelist", "index": idx, "cmd": cmd, "expected": command_whitelist})
                     continue
-            if command_blacklist:
-                if any(cmd.startswith(p) for p in command_blacklist):
+            if blacklist_prefixes:
+                if cmd.startswith(blacklist_prefixes):
                     reasons.append({"type": "command_in_blacklist", "index": idx, "cmd": cmd})
                     if enforced:
                         continue
@@ -164,6 +152,7 @@ def validate_commands(
     cleaned = []
     reasons = []
     enforced = _policy_enforced(enforce_policy)
+    allowed_prefixes = tuple(allowed_commands)
     for idx, item in enumerate(commands or []):
         if isinstance(item, dict):
             cmd = (item.get("cmd") or "").strip()
@@ -176,7 +165,7 @@ def validate_commands(
             timeout = int(default_timeout)
         if not cmd:
             continue
-        if not any(cmd.startswith(p) for p in allowed_commands):
+        if not cmd.startswith(allowed_prefixes):
             reasons.append({"type": "command_not_allowed", "index": idx, "cmd": cmd, "expected": allowed_commands})
             if enforced:
                 continue
@@ -17,6 +17,56 @@ from infra.io_utils import read_json
 from services.controller.sqlite_mirror import ensure_sqlite_schema
 
 
+_UPSERT_RUN_SQL = """INSERT INTO runs(run_id, plan_id, status, workspace, updated_at, raw_json) 
+                   VALUES(?,?,?,?,?,?) 
+                   ON CONFLICT(run_id) DO UPDATE SET 
+                   plan_id=excluded.plan_id, 
+                   status=excluded.status, 
+                   workspace=excluded.workspace,
+                   updated_at=excluded.updated_at, 
+                   raw_json=excluded.raw_json"""
+_BATCH_SIZE = 10000
+
+
+def _report_ok(plan_id: str, run_id: str, status: str, workspace: str) -> None:
+    display_workspace = workspace if workspace else "N/A"
+    print(f"  OK {plan_id}/{run_id} -> status={status}, workspace={display_workspace}")
+
+
+# 批量写入一组 run 记录，整批失败时回滚该批并逐行重试；写入后再逐行报告，返回 (成功数, 失败数)
+def _flush_runs(conn: sqlite3.Connection, pending: list[tuple]) -> tuple[int, int]:
+    if not pending:
+        return 0, 0
+    conn.execute("SAVEPOINT backfill_batch")
+    try:
+        conn.executemany(_UPSERT_RUN_SQL, pending)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO backfill_batch")
+        conn.execute("RELEASE backfill_batch")
+    else:
+        conn.execute("RELEASE backfill_batch")
+        for run_id, plan_id, status, workspace, _, _ in pending:
+            _report_ok(plan_id, run_id, status, workspace)
+        ok = len(pending)
+        pending.clear()
+        return ok, 0
+
+    ok = 0
+    errors = 0
+    for row in pending:
+        run_id, plan_id, status, workspace = row[:4]
+        try:
+            conn.execute(_UPSERT_RUN_SQL, row)
+        except sqlite3.Error as exc:
+            errors += 1
+            print(f"  ERROR {plan_id}/{run_id}: {exc}")
+        else:
+            ok += 1
+            _report_ok(plan_id, run_id, status, workspace)
+    pending.clear()
+    return ok, errors
+
+
 def _resolve_plan_workspace(plan_dir: Path) -> str | None:
     cap_path = plan_dir / "capabilities.json"
     if cap_path.exists():
@@ -56,6 +106,7 @@ def backfill_runs(root: Path, dry_run: bool = False) -> None:
 
         count = 0
         errors = 0
+        pending: list[tuple] = []
 
         for ws_dir in sorted(ws_root.iterdir()):
             if not ws_dir.is_dir():
@@ -112,30 +163,24 @@ def backfill_runs(root: Path, dry_run: bool = False) -> None:
                             ensure_ascii=False,
                         )
 
-                        if not dry_run:
-                            conn.execute(
-                                """INSERT INTO runs(run_id, plan_id, status, workspace, updated_at, raw_json) 
-                                   VALUES(?,?,?,?,?,?) 
-                                   ON CONFLICT(run_id) DO UPDATE SET 
-                                   plan_id=excluded.plan_id, 
-                                   status=excluded.status, 
-                                   workspace=excluded.workspace,
-                                   updated_at=excluded.updated_at, 
-                                   raw_json=excluded.raw_json""",
-                                (run_id, plan_id, status, workspace, now_ms, raw_json),
-                            )
-
-                        count += 1
-                        display_workspace = workspace if workspace else "N/A"
-                        print(
-                            f"  OK {plan_id}/{run_id} -> status={status}, workspace={display_workspace}"
-                        )
+                        if dry_run:
+                            count += 1
+                            _report_ok(plan_id, run_id, status, workspace)
+                        else:
+                            pending.append((run_id, plan_id, status, workspace, now_ms, raw_json))
+                            if len(pending) >= _BATCH_SIZE:
+                                batch_ok, batch_errors = _flush_runs(conn, pending)
+                                count += batch_ok
+                                errors += batch_errors
 
                     except Exception as exc:
                         errors += 1
                         print(f"  ERROR {plan_id}/{run_id}: {exc}")
 
         if not dry_run:
+            batch_ok, batch_errors = _flush_runs(conn, pending)
+            count += batch_ok
+            errors += batch_errors
             conn.commit()
 
         prefix = "DRY RUN - " if dry_run else ""
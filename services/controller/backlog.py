@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -9,21 +10,25 @@ from workspace_utils import normalize_workspace_path
 __all__ = ["list_backlog_files", "load_backlog_map", "load_backlog_map_filtered"]
 
 
+def _scan_json_files(directory: str) -> list[Path]:
+    try:
+        with os.scandir(directory) as it:
+            return [Path(entry.path) for entry in it if entry.name.endswith(".json") and entry.is_file()]
+    except OSError:
+        return []
+
+
 def list_backlog_files(root: Path) -> list[Path]:
-    backlog_files: list[Path] = []
-    default_dir = root / "backlog"
-    if default_dir.exists():
-        backlog_files.extend(default_dir.glob("*.json"))
-
-    workspace_root = root / "artifacts" / "workspaces"
-    if workspace_root.exists():
-        for ws_dir in workspace_root.iterdir():
-            if not ws_dir.is_dir():
-                continue
-            ws_backlog = ws_dir / "backlog"
-            if not ws_backlog.exists():
-                continue
-            backlog_files.extend(ws_backlog.glob("*.json"))
+    backlog_files = _scan_json_files(os.path.join(root, "backlog"))
+
+    workspace_root = os.path.join(root, "artifacts", "workspaces")
+    try:
+        with os.scandir(workspace_root) as it:
+            ws_dirs = [entry.path for entry in it if entry.is_dir()]
+    except OSError:
+        ws_dirs = []
+    for ws_dir in ws_dirs:
+        backlog_files.extend(_scan_json_files(os.path.join(ws_dir, "backlog")))
 
     return sorted(backlog_files)
 
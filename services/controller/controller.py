@@ -148,9 +148,9 @@ class TaskController:
         run_dir.mkdir(parents=True, exist_ok=True)
 
         policy, policy_source, profile, capabilities = load_policy(root, workspace_path, self._profile_service)
-        write_json(run_dir / "policy.json", policy)
+        write_json(run_dir / "policy.json", policy, indent=2)
         if capabilities:
-            write_json(run_dir / "capabilities.json", {"workspace": workspace_path, "capabilities": capabilities})
+            write_json(run_dir / "capabilities.json", {"workspace": workspace_path, "capabilities": capabilities}, indent=2)
         if profile:
             print(f"[PROFILE] workspace_id={profile.get('workspace_id')} fingerprint={profile.get('fingerprint')}")
 
@@ -351,7 +351,7 @@ class TaskController:
                     passed, reasons = self._verifier.verify_task(run_dir, task_id, workspace_path=verify_root)
                 final_reasons = reasons
 
-                write_json(round_dir / "verification.json", {"passed": passed, "reasons": reasons})
+                write_json(round_dir / "verification.json", {"passed": passed, "reasons": reasons}, indent=2)
 
                 _append_event(
                     run_dir,
@@ -408,7 +408,7 @@ class TaskController:
                         payload["missing_suggestions"] = missing_suggestions
                     if validation_reasons:
                         payload["validation_reasons"] = validation_reasons
-                    write_json(round_dir / "rework_request.json", payload)
+                    write_json(round_dir / "rework_request.json", payload, indent=2)
                     last_failure_context = payload
                     last_failure_round = round_id
                 if not passed and last_failure_context is None:
@@ -9,6 +9,8 @@ from workspace_utils import get_workspace_dir
 
 __all__ = ["load_policy", "merge_checks", "is_high_risk", "has_execution_check"]
 
+_EXEC_CHECK_TYPES = frozenset({"command", "command_contains", "http_check"})
+
 
 def load_policy(
     root: Path,
@@ -61,10 +63,7 @@ def load_policy(
 
 
 def has_execution_check(checks: list[dict]) -> bool:
-    for check in checks or []:
-        if check.get("type") in {"command", "command_contains", "http_check"}:
-            return True
-    return False
+    return any(check.get("type") in _EXEC_CHECK_TYPES for check in checks or ())
 
 
 def merge_checks(task_checks: list[dict], policy_checks: list[dict], high_risk: bool = False) -> list[dict]:
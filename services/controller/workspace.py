@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from config.settings import get_settings
@@ -7,25 +9,36 @@ from detect_workspace import detect_workspace
 
 __all__ = ["auto_select_workspace"]
 
+_DETECT_WORKERS = 8
+
+
+def _is_candidate(info: dict) -> bool:
+    return info.get("project_type") != "unknown" or bool(info.get("detected")) or bool(info.get("checks"))
+
 
 def auto_select_workspace(workspace: Path) -> Path:
     workspace = workspace.resolve()
-    info = detect_workspace(workspace)
-    detected = info.get("detected") or []
-    if info.get("project_type") != "unknown" or detected or info.get("checks"):
+    if _is_candidate(detect_workspace(workspace)):
         return workspace
-    candidates: list[tuple[int, Path]] = []
     deny = set(get_settings().workspace.deny_write or [])
-    for child in sorted(workspace.iterdir()):
-        if not child.is_dir():
-            continue
-        name = child.name
-        if name.startswith(".") or name in deny:
+    with os.scandir(workspace) as it:
+        children = sorted(
+            Path(entry.path)
+            for entry in it
+            if not entry.name.startswith(".") and entry.name not in deny and entry.is_dir()
+        )
+    if not children:
+        return workspace
+    if len(children) > 1:
+        with ThreadPoolExecutor(max_workers=min(_DETECT_WORKERS, len(children))) as pool:
+            infos = list(pool.map(detect_workspace, children))
+    else:
+        infos = [detect_workspace(children[0])]
+    candidates: list[tuple[int, Path]] = []
+    for child, sub_info in zip(children, infos):
+        if not _is_candidate(sub_info):
             continue
-        sub_info = detect_workspace(child)
         sub_detected = sub_info.get("detected") or []
-        if sub_info.get("project_type") == "unknown" and not sub_detected and not sub_info.get("checks"):
-            continue
         score = len(sub_detected) + (1 if sub_info.get("checks") else 0)
         candidates.append((score, child))
     if not candidates:
@@ -1,4 +1,8 @@
 import argparse
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 from services.code_graph_service import CodeGraphService
@@ -11,6 +15,103 @@ def create_default_controller(root: Path) -> TaskController:
     return TaskController(root, ProfileService(), VerifierService(root), CodeGraphService(cache_root=root))
 
 
+def run(
+    root: Path,
+    plan_id: str | None,
+    mode: str = "autopilot",
+    workspace: str | Path | None = None,
+    max_rounds: int = 3,
+    controller: TaskController | None = None,
+) -> None:
+    """In-process equivalent of `python -m services.controller_service`."""
+    args = argparse.Namespace(
+        root=str(root),
+        plan_id=plan_id,
+        workspace=str(workspace) if workspace else None,
+        max_rounds=max_rounds,
+        mode=mode,
+    )
+    (controller or create_default_controller(root)).run(args)
+
+
+# 常驻模式：从 stdin 逐行读取请求，每个请求回复一行 JSON 到 stdout
+def serve(root: Path) -> None:
+    """Serve `{"action": "run", ...}` requests until `{"action": "quit"}` or EOF."""
+    sys.stdout.flush()
+    requests_in = os.fdopen(os.dup(sys.stdin.fileno()), "r", encoding="utf-8")
+    reply_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    # controller 及其子进程的输出改走 stderr，避免污染协议通道
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    # 子进程读 stdin 时应立即得到 EOF，而不是阻塞在请求管道上或吞掉协议数据
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, sys.stdin.fileno())
+    os.close(devnull)
+    controller = create_default_controller(root)
+    for line in requests_in:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            reply = {"ok": False, "error": f"invalid request: {exc}"}
+        else:
+            if request.get("action") == "quit":
+                break
+            try:
+                run(
+                    root,
+                    request.get("plan_id"),
+                    request.get("mode", "autopilot"),
+                    request.get("workspace"),
+                    request.get("max_rounds", 3),
+                    controller=controller,
+                )
+                reply = {"ok": True}
+            except Exception as exc:
+                reply = {"ok": False, "error": str(exc)}
+        sys.stdout.flush()
+        reply_out.write(json.dumps(reply, ensure_ascii=False) + "\n")
+    reply_out.close()
+    requests_in.close()
+
+
+class ControllerWorker:
+    """Client for a long-lived `python -m services.controller_service --serve` process."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "services.controller_service", "--root", str(root), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            cwd=root,
+        )
+
+    # 发送一次 run 请求并等待结果
+    def run(self, plan_id: str | None, mode: str = "autopilot", workspace: str | Path | None = None) -> None:
+        request = {"action": "run", "plan_id": plan_id, "mode": mode, "workspace": str(workspace) if workspace else None}
+        self.proc.stdin.write(json.dumps(request, ensure_ascii=False) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"controller worker exited with code {self.proc.wait()}")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(f"controller failed: {reply.get('error')}")
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write(json.dumps({"action": "quit"}) + "\n")
+                self.proc.stdin.close()
+            except OSError:
+                pass
+        self.proc.wait()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--root", required=True, help="repo root path")
@@ -18,9 +119,13 @@ def main() -> None:
     parser.add_argument("--workspace", dest="workspace", help="workspace path")
     parser.add_argument("--max-rounds", dest="max_rounds", type=int, default=3, help="max retry rounds")
     parser.add_argument("--mode", dest="mode", default="autopilot", choices=["autopilot", "manual"], help="run mode")
+    parser.add_argument("--serve", action="store_true", help="serve run requests over stdin/stdout")
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
+    if args.serve:
+        serve(root)
+        return
     controller = create_default_controller(root)
     controller.run(args)
 
@@ -1,28 +1,15 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
+from infra.io_utils import json_loads
+from services.controller.backlog import list_backlog_files
+
 from .utils import reason
 
 
 def _list_backlog_files(root: Path) -> list[Path]:
-    backlog_files: list[Path] = []
-    default_dir = root / "backlog"
-    if default_dir.exists():
-        backlog_files.extend(default_dir.glob("*.json"))
-
-    workspace_root = root / "artifacts" / "workspaces"
-    if workspace_root.exists():
-        for ws_dir in workspace_root.iterdir():
-            if not ws_dir.is_dir():
-                continue
-            ws_backlog = ws_dir / "backlog"
-            if not ws_backlog.exists():
-                continue
-            backlog_files.extend(ws_backlog.glob("*.json"))
-
-    return sorted(backlog_files)
+    return list_backlog_files(root)
 
 
 def _find_task_in_backlog(root: Path, task_id: str) -> dict | None:
@@ -30,7 +17,7 @@ def _find_task_in_backlog(root: Path, task_id: str) -> dict | None:
         if not path.exists():
             continue
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json_loads(path.read_bytes())
         except Exception:
             continue
         for task in data.get("tasks", []):
@@ -54,13 +41,13 @@ def _find_task_in_history(root: Path, plan_id: str, task_id: str) -> dict | None
     if not history_path.exists():
         return None
     try:
-        with history_path.open("r", encoding="utf-8") as handle:
+        with history_path.open("rb") as handle:
             for line in handle:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    rec = json.loads(line)
+                    rec = json_loads(line)
                 except Exception:
                     continue
                 if rec.get("id") == task_id:
@@ -75,13 +62,13 @@ def _find_task_in_plan_artifacts(root: Path, plan_id: str, task_id: str) -> dict
     tasks_path = exec_root / "plan.tasks.jsonl"
     if tasks_path.exists():
         try:
-            with tasks_path.open("r", encoding="utf-8") as handle:
+            with tasks_path.open("rb") as handle:
                 for line in handle:
                     line = line.strip()
                     if not line:
                         continue
                     try:
-                        rec = json.loads(line)
+                        rec = json_loads(line)
                     except Exception:
                         continue
                     rec_id = rec.get("step_id") or rec.get("id")
@@ -92,7 +79,7 @@ def _find_task_in_plan_artifacts(root: Path, plan_id: str, task_id: str) -> dict
     plan_path = exec_root / "plan.json"
     if plan_path.exists():
         try:
-            plan_obj = json.loads(plan_path.read_text(encoding="utf-8"))
+            plan_obj = json_loads(plan_path.read_bytes())
         except Exception:
             return None
         tasks = plan_obj.get("raw_plan", {}).get("tasks", []) if isinstance(plan_obj, dict) else []
@@ -2,9 +2,13 @@
 sqlite_mirror.py - SQLite mirror operations
 """
 
+import atexit
 import json
+import os
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
 from config import resolve_db_path
@@ -20,6 +24,76 @@ __all__ = [
 ]
 
 
+# 缓存的连接及打开时数据库文件的 (st_dev, st_ino)
+_CONNECTIONS: dict[str, tuple[sqlite3.Connection, tuple[int, int] | None]] = {}
+_CONN_LOCK = threading.RLock()
+# Windows 上打开的句柄会阻止 Java 侧删除/重命名数据库文件，因此不跨调用保留连接
+_KEEP_CONNECTIONS = os.name != "nt"
+
+
+def _file_identity(db_path: Path) -> tuple[int, int] | None:
+    try:
+        st = db_path.stat()
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _get_conn(db_path: Path) -> sqlite3.Connection:
+    """Return the process-wide connection for db_path, creating the schema on first open.
+
+    The connection is reopened when the file was replaced or removed since it was opened.
+    Callers must hold _CONN_LOCK while using the connection; use _mirror_conn.
+    """
+    key = str(db_path)
+    cached = _CONNECTIONS.get(key)
+    if cached is not None:
+        conn, identity = cached
+        if identity is not None and identity == _file_identity(db_path):
+            return conn
+        _CONNECTIONS.pop(key, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(key, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+    except Exception:
+        pass
+    ensure_schema(conn)
+    conn.commit()
+    _CONNECTIONS[key] = (conn, _file_identity(db_path))
+    return conn
+
+
+@contextmanager
+def _mirror_conn(db_path: Path):
+    """Hold the lock and run one transaction on the cached connection for db_path."""
+    with _CONN_LOCK:
+        conn = _get_conn(db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            if not _KEEP_CONNECTIONS:
+                _CONNECTIONS.pop(str(db_path), None)
+                conn.close()
+
+
+@atexit.register
+def _close_connections() -> None:
+    with _CONN_LOCK:
+        for conn, _ in _CONNECTIONS.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        _CONNECTIONS.clear()
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
     """Ensure the required tables exist."""
     conn.execute("""
@@ -58,9 +132,7 @@ def mirror_plan(root: Path, plan_id: str, workspace: str, tasks_count: int = 0,
     now_ms = int(time.time() * 1000)
 
     try:
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(str(db_path)) as conn:
-            ensure_schema(conn)
+        with _mirror_conn(db_path) as conn:
             conn.execute(
                 """INSERT INTO plans(plan_id, workspace_id, workspace_path, tasks_count, input_task, updated_at)
                    VALUES(?,?,?,?,?,?)
@@ -72,7 +144,6 @@ def mirror_plan(root: Path, plan_id: str, workspace: str, tasks_count: int = 0,
                        updated_at=excluded.updated_at""",
                 (plan_id, workspace_id, workspace_path, tasks_count, input_task, now_ms),
             )
-            conn.commit()
     except Exception as e:
         print(f"[SQLITE] mirror_plan error: {e}")
 
@@ -88,9 +159,7 @@ def mirror_run(root: Path, run_id: str, plan_id: str, workspace: str, status: st
     now_ms = int(time.time() * 1000)
 
     try:
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(str(db_path)) as conn:
-            ensure_schema(conn)
+        with _mirror_conn(db_path) as conn:
             conn.execute(
                 """INSERT INTO runs(run_id, plan_id, workspace_id, workspace_path, status, task, updated_at)
                    VALUES(?,?,?,?,?,?,?)
@@ -103,7 +172,6 @@ def mirror_run(root: Path, run_id: str, plan_id: str, workspace: str, status: st
                        updated_at=excluded.updated_at""",
                 (run_id, plan_id, workspace_id, workspace_path, status, task, now_ms),
             )
-            conn.commit()
     except Exception as e:
         print(f"[SQLITE] mirror_run error: {e}")
 
@@ -116,12 +184,11 @@ def update_run_status(root: Path, run_id: str, status: str) -> None:
 
     try:
         now_ms = int(time.time() * 1000)
-        with sqlite3.connect(str(db_path)) as conn:
+        with _mirror_conn(db_path) as conn:
             conn.execute(
                 "UPDATE runs SET status=?, updated_at=? WHERE run_id=?",
                 (status, now_ms, run_id),
             )
-            conn.commit()
     except Exception:
         pass
 
@@ -133,10 +200,9 @@ def delete_plan(root: Path, plan_id: str) -> None:
         return
 
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with _mirror_conn(db_path) as conn:
             conn.execute("DELETE FROM runs WHERE plan_id=?", (plan_id,))
             conn.execute("DELETE FROM plans WHERE plan_id=?", (plan_id,))
-            conn.commit()
     except Exception:
         pass
 
@@ -148,8 +214,7 @@ def delete_run(root: Path, run_id: str) -> None:
         return
 
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with _mirror_conn(db_path) as conn:
             conn.execute("DELETE FROM runs WHERE run_id=?", (run_id,))
-            conn.commit()
     except Exception:
         pass
@@ -0,0 +1,47 @@
+import sqlite3
+
+from scripts.backfill_runs import _flush_runs
+
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE runs(run_id TEXT PRIMARY KEY, plan_id TEXT, status TEXT NOT NULL, "
+        "workspace TEXT, updated_at INTEGER, raw_json TEXT)"
+    )
+    return conn
+
+
+def _row(run_id, status="done"):
+    return (run_id, "plan-1", status, "/ws", 1, "{}")
+
+
+def test_flush_runs_writes_batch(capsys):
+    conn = _conn()
+    pending = [_row("r1"), _row("r2")]
+    assert _flush_runs(conn, pending) == (2, 0)
+    assert pending == []
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    assert capsys.readouterr().out.count("  OK ") == 2
+
+
+def test_flush_runs_rolls_back_failed_batch_and_retries_rows(capsys):
+    conn = _conn()
+    pending = [_row("r1"), _row("r2", status=None), _row("r3")]
+    assert _flush_runs(conn, pending) == (2, 1)
+    assert pending == []
+    conn.commit()
+    rows = [r[0] for r in conn.execute("SELECT run_id FROM runs ORDER BY run_id")]
+    assert rows == ["r1", "r3"]
+    out = capsys.readouterr().out
+    assert "ERROR plan-1/r2" in out
+    assert "OK plan-1/r2" not in out
+    assert out.count("  OK ") == 2
+
+
+def test_flush_runs_keeps_earlier_batches_in_transaction():
+    conn = _conn()
+    assert _flush_runs(conn, [_row("r1")]) == (1, 0)
+    assert _flush_runs(conn, [_row("r2", status=None)]) == (0, 1)
+    conn.commit()
+    assert [r[0] for r in conn.execute("SELECT run_id FROM runs")] == ["r1"]
@@ -0,0 +1,11 @@
+from infra.codex_runner import decode_output
+
+
+def test_decode_output_utf8_and_gbk():
+    text = "错误: 文件未找到\n"
+    assert decode_output(text.encode("utf-8")) == text
+    assert decode_output(text.encode("gbk")) == text
+
+
+def test_decode_output_invalid_bytes():
+    assert decode_output(b"ok \xff\xfe") == "ok ��"
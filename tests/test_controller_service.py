@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from services.controller_service import ControllerWorker
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# 用假 controller 运行 serve：每次 run 启动一个读取 stdin 的子进程并记录读到的内容
+_FAKE_SERVE = textwrap.dedent(
+    """
+    import subprocess, sys
+    from pathlib import Path
+    import services.controller_service as svc
+
+    class FakeController:
+        def run(self, args):
+            print("controller output for", args.plan_id)
+            if args.plan_id == "boom":
+                raise ValueError("boom")
+            got = subprocess.run(
+                [sys.executable, "-c", "import sys; print(repr(sys.stdin.read()))"],
+                stdout=subprocess.PIPE, text=True, timeout=10,
+            ).stdout.strip()
+            (Path(args.root) / f"{args.plan_id}.stdin").write_text(got, encoding="utf-8")
+
+    svc.create_default_controller = lambda root: FakeController()
+    svc.serve(Path(sys.argv[1]))
+    """
+)
+
+
+def test_serve_replies_one_line_per_request(tmp_path):
+    requests = [
+        {"action": "run", "plan_id": "p1", "mode": "autopilot", "workspace": None},
+        {"action": "run", "plan_id": "boom", "mode": "autopilot", "workspace": None},
+        {"action": "run", "plan_id": "p2", "mode": "manual", "workspace": None},
+        {"action": "quit"},
+    ]
+    proc = subprocess.run(
+        [sys.executable, "-c", _FAKE_SERVE, str(tmp_path)],
+        input="".join(json.dumps(r) + "\n" for r in requests),
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    replies = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [r["ok"] for r in replies] == [True, False, True]
+    assert "boom" in replies[1]["error"]
+    # controller 的输出走 stderr，不会混进回复通道
+    assert "controller output for p1" in proc.stderr
+    # 子进程的 stdin 是空设备，读不到后续请求
+    assert (tmp_path / "p1.stdin").read_text(encoding="utf-8") == "''"
+    assert (tmp_path / "p2.stdin").read_text(encoding="utf-8") == "''"
+
+
+@pytest.mark.integration
+def test_controller_worker_runs_and_closes(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", str(REPO_ROOT))
+    worker = ControllerWorker(tmp_path)
+    try:
+        worker.run("missing-plan")
+        worker.run("missing-plan", mode="manual")
+    finally:
+        worker.close()
+    assert worker.proc.returncode == 0
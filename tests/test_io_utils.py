@@ -0,0 +1,27 @@
+import os
+
+from infra.io_utils import write_bytes_atomic
+
+
+def test_write_bytes_atomic_replaces_and_leaves_no_temp(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_bytes(b"old")
+    write_bytes_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+    write_bytes_atomic(str(tmp_path / "durable.json"), b"{}", durable=True)
+    assert (tmp_path / "durable.json").read_bytes() == b"{}"
+
+
+def test_write_bytes_atomic_falls_back_when_replace_fails(tmp_path, monkeypatch):
+    path = tmp_path / "out.json"
+    path.write_bytes(b"old")
+
+    def refuse(src, dst):
+        raise PermissionError("file in use")
+
+    monkeypatch.setattr(os, "replace", refuse)
+    write_bytes_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["out.json"]
@@ -0,0 +1,123 @@
+import json
+import os
+
+import pytest
+
+import plan_and_run
+from plan_and_run import BacklogCache, _scan_plan_state
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = BacklogCache()
+    monkeypatch.setattr(plan_and_run, "_BACKLOG_CACHE", fresh)
+    return fresh
+
+
+def _write_tasks(path, tasks):
+    path.write_text(json.dumps({"tasks": tasks}), encoding="utf-8")
+
+
+def test_backlog_cache_invalidates_on_stat_change(tmp_path):
+    path = tmp_path / "a.json"
+    _write_tasks(path, [{"id": "t1"}])
+    cache = BacklogCache()
+    st = path.stat()
+    tasks = [{"id": "t1"}]
+    cache.put(path, st, tasks)
+    assert cache.get(path, path.stat()) is tasks
+
+    _write_tasks(path, [{"id": "t1"}, {"id": "t2"}])
+    assert cache.get(path, path.stat()) is None
+
+    cache.put(path, st, tasks)
+    cache.forget(path)
+    assert cache.get(path, st) is None
+
+
+def test_backlog_cache_digest_requires_unchanged_file(tmp_path):
+    path = tmp_path / "a.json"
+    _write_tasks(path, [])
+    cache = BacklogCache()
+    cache.remember(path, [], b"digest")
+    assert cache.digest(path) == b"digest"
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.digest(path) is None
+
+    cache.remember(path, [], b"digest")
+    path.unlink()
+    assert cache.digest(path) is None
+
+
+def test_load_backlog_map_uses_cache_until_file_changes(tmp_path, cache, monkeypatch):
+    path = tmp_path / "plan.json"
+    _write_tasks(path, [{"id": "t1", "status": "todo"}])
+    monkeypatch.setattr(plan_and_run, "_list_backlog_files", lambda root: [path])
+
+    first = plan_and_run._load_backlog_map(tmp_path)
+    assert plan_and_run._load_backlog_map(tmp_path)[path] is first[path]
+
+    _write_tasks(path, [{"id": "t1", "status": "done"}, {"id": "t2", "status": "todo"}])
+    reloaded = plan_and_run._load_backlog_map(tmp_path)[path]
+    assert [t["id"] for t in reloaded] == ["t1", "t2"]
+
+
+def test_write_backlog_file_skips_unchanged_content(tmp_path, cache, monkeypatch):
+    path = tmp_path / "plan.json"
+    tasks = [{"id": "t1", "status": "todo"}]
+    writes = []
+    real_write = plan_and_run.write_bytes_atomic
+
+    def counting_write(target, payload, **kwargs):
+        writes.append(target)
+        real_write(target, payload, **kwargs)
+
+    monkeypatch.setattr(plan_and_run, "write_bytes_atomic", counting_write)
+
+    plan_and_run._write_backlog_file((path, tasks))
+    plan_and_run._write_backlog_file((path, tasks))
+    assert writes == [path]
+
+    tasks[0]["status"] = "done"
+    plan_and_run._write_backlog_file((path, tasks))
+    assert writes == [path, path]
+    assert json.loads(path.read_text(encoding="utf-8"))["tasks"][0]["status"] == "done"
+
+
+def test_write_backlog_file_rewrites_after_external_change(tmp_path, cache):
+    path = tmp_path / "plan.json"
+    tasks = [{"id": "t1", "status": "todo"}]
+    plan_and_run._write_backlog_file((path, tasks))
+    _write_tasks(path, [{"id": "other"}])
+
+    plan_and_run._write_backlog_file((path, tasks))
+    assert json.loads(path.read_text(encoding="utf-8")) == {"tasks": tasks}
+
+
+def test_scan_plan_state():
+    def backlog(*tasks):
+        return {"tasks": [{"plan_id": "p", **t} for t in tasks] + [{"plan_id": "other", "id": "x", "status": "todo"}]}
+
+    assert _scan_plan_state(backlog(), "p") == (False, False)
+    assert _scan_plan_state(backlog({"id": "a", "status": "done"}), "p") == (False, False)
+    assert _scan_plan_state(
+        backlog({"id": "a", "status": "done"}, {"id": "b", "status": "todo", "dependencies": ["a"]}), "p"
+    ) == (True, True)
+    assert _scan_plan_state(
+        backlog({"id": "a", "status": "doing"}, {"id": "b", "status": "todo", "dependencies": ["a"]}), "p"
+    ) == (True, False)
+    # 依赖在后面才出现的 done 任务也要计入
+    assert _scan_plan_state(
+        backlog({"id": "b", "status": "todo", "dependencies": ["a"]}, {"id": "a", "status": "done"}), "p"
+    ) == (True, True)
+
+
+def test_scan_plan_state_returns_early_on_todo_without_dependencies():
+    # 后面的 done 任务缺少 id，若继续扫描会 KeyError
+    backlog = {"tasks": [
+        {"plan_id": "p", "id": "a", "status": "todo"},
+        {"plan_id": "p", "status": "done"},
+    ]}
+    assert _scan_plan_state(backlog, "p") == (True, True)
@@ -0,0 +1,38 @@
+import itertools
+from pathlib import Path
+
+from policy_validator import ALLOWED_PATH_RE, _norm_rel_path, is_safe_relative_path
+
+
+# 改为单个正则之前的逐条规则实现
+def _legacy_is_safe_relative_path(path: str) -> bool:
+    path = _norm_rel_path(path)
+    if not path:
+        return False
+    if path.startswith("/") or path.startswith("\\"):
+        return False
+    if ":" in path:
+        return False
+    if any(p == ".." for p in Path(path).parts):
+        return False
+    return bool(ALLOWED_PATH_RE.match(path))
+
+
+def test_safe_rel_path_re_matches_legacy_rules():
+    alphabet = ["a", ".", "..", "/", "\\", ":", " ", "-", "_", "\n", "é"]
+    for n in range(5):
+        for parts in itertools.product(alphabet, repeat=n):
+            path = "".join(parts)
+            assert is_safe_relative_path(path) == _legacy_is_safe_relative_path(path), repr(path)
+
+
+def test_safe_rel_path_examples():
+    assert is_safe_relative_path("outputs/result.txt")
+    assert is_safe_relative_path("src\\pkg\\mod.py")
+    assert is_safe_relative_path("a/..b/c..")
+    assert not is_safe_relative_path("")
+    assert not is_safe_relative_path("/etc/passwd")
+    assert not is_safe_relative_path("C:/temp")
+    assert not is_safe_relative_path("a/../b")
+    assert not is_safe_relative_path("outputs/{name}")
+    assert not is_safe_relative_path(None)